@@ -3,13 +3,14 @@ import logging
 from typing import List
 
 from django.conf import settings
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import F, Q
 from django.shortcuts import get_object_or_404
 from gevent import joinall, spawn
 from openai import OpenAI
 
 from workflow.models import Examples, Prompt, Task, WorkflowConfig, Workflows
+from workflow.utils import get_workflow_config
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,17 @@ class DataFetcher:
         self.max_iterations = max_iterations
         self.max_concurrent_fetches = max_concurrent_fetches
         self.batch_size = batch_size
+        # memoized per fetcher instance (one fetcher per request/task), so the
+        # per-iteration and per-batch config lookups skip even the cache
+        # round trip after the first fetch
+        self._workflow_configs = {}
+
+    def _get_config(self, workflow_config_id) -> WorkflowConfig:
+        if workflow_config_id not in self._workflow_configs:
+            self._workflow_configs[workflow_config_id] = get_workflow_config(
+                workflow_config_id
+            )
+        return self._workflow_configs[workflow_config_id]
 
     def generate_or_refine(
         self,
@@ -49,7 +61,7 @@ class DataFetcher:
             refine=refine,
         )
         logger.info(workflow_config_id)
-        config = get_object_or_404(WorkflowConfig, id=workflow_config_id)
+        config = self._get_config(workflow_config_id)
         try:
             total_batches = max(
                 1,
@@ -120,7 +132,7 @@ class DataFetcher:
         whether to refine based on existing examples, and the specified number of samples to generate.
         """
         workflow = Workflows.objects.get(workflow_id=workflow_id)
-        config = get_object_or_404(WorkflowConfig, id=workflow.workflow_config.id)
+        config = self._get_config(workflow.workflow_config.id)
 
         user_prompt_template = config.user_prompt_template
 
@@ -164,7 +176,7 @@ class DataFetcher:
         fields,
         prompt_id,
     ):
-        config = get_object_or_404(WorkflowConfig, id=workflow_config_id)
+        config = self._get_config(workflow_config_id)
         response = self.call_llm_generate(
             user_prompt,
             config.system_prompt,
@@ -257,16 +269,26 @@ class DataFetcher:
                 for key in keys:
                     key_response = response[key]
                     data_values = list(key_response)
+                    created = 0
                     for data in data_values:
                         validated_data = Model.model_validate(data, strict=True)
                         example_data = validated_data.dict()
-                        example = Examples.objects.create(
-                            workflow=workflow,
-                            text=example_data,
-                            label=key,
-                            task_id=task_id,
-                            prompt_id=prompt_id,
-                        )
+                        try:
+                            # savepoint per row: refinement feeds prior
+                            # examples back into the prompt, so the model
+                            # occasionally regenerates an existing text; skip
+                            # it instead of rolling back the whole batch
+                            with transaction.atomic():
+                                example = Examples.objects.create(
+                                    workflow=workflow,
+                                    text=example_data,
+                                    label=key,
+                                    task_id=task_id,
+                                    prompt_id=prompt_id,
+                                )
+                        except IntegrityError:
+                            continue
+                        created += 1
                         if task_id is None:
                             self.examples.append(
                                 {
@@ -278,8 +300,8 @@ class DataFetcher:
                                 }
                             )
 
-                    logger.info(f"generated {len(data_values)} examples for key {key}")
-                    generated_examples += len(data_values)
+                    logger.info(f"generated {created} examples for key {key}")
+                    generated_examples += created
 
         except Exception as e:
             logger.error(f"Error parsing response: {str(e)}")
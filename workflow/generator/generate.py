@@ -116,6 +116,80 @@ def process_task(
     task.save()
 
 
+@shared_task(bind=True, max_retries=settings.CELERY_MAX_RETRIES, retry_backoff=True)
+def iterate_task(
+    self,
+    task_id: str,
+    total_examples: int,
+    max_iterations: int,
+    max_concurrent_fetches: int,
+    batch_size: int,
+    refine: bool,
+):
+    """
+    Runs one iteration of example generation/refinement for a workflow off the
+    request cycle; IterateWorkflowView queues this and returns a task id.
+    """
+    task = Task.objects.get(id=task_id)
+    workflow: Workflows = task.workflow
+    workflow.status = "ITERATION"
+    workflow.save()
+    task.status = "PROCESSING"
+    task.total_samples = total_examples
+    task.save()
+
+    Model, _ = create_pydantic_model(workflow.workflow_config.schema_example)
+
+    fetcher = DataFetcher(
+        max_iterations=max_iterations,
+        max_concurrent_fetches=max_concurrent_fetches,
+        batch_size=batch_size,
+    )
+    prompt: Prompt = workflow.latest_prompt
+    fetcher.generate_or_refine(
+        workflow_id=workflow.workflow_id,
+        total_examples=total_examples,
+        workflow_config_id=workflow.workflow_config.id,
+        llm_model=workflow.llm_model,
+        Model=Model,
+        prompt=prompt.user_prompt,
+        prompt_id=prompt.id,
+        refine=refine,
+        iteration=1,
+    )
+
+    costs = get_model_cost(workflow.llm_model)
+
+    getcontext().prec = 6
+
+    input_cost = Decimal(fetcher.input_tokens * costs["input"]) / Decimal(1000)
+    output_cost = Decimal(fetcher.output_tokens * costs["output"]) / Decimal(1000)
+
+    iteration_cost = input_cost + output_cost
+    iteration_cost = iteration_cost.quantize(Decimal("0.0001"))
+    workflow.cost += iteration_cost
+    workflow.cost = workflow.cost.quantize(Decimal("0.0001"))
+
+    total_batches = max(
+        1,
+        (workflow.total_examples + batch_size - 1) // batch_size,
+    )
+
+    workflow.estimated_dataset_cost = Decimal(
+        Decimal(1.25) * iteration_cost * total_batches
+    )
+    workflow.estimated_dataset_cost = workflow.estimated_dataset_cost.quantize(
+        Decimal("0.0001")
+    )
+
+    workflow.status = "IDLE"
+    workflow.save()
+
+    task.generated_samples = fetcher.generated
+    task.status = "COMPLETED"
+    task.save()
+
+
 class GenerateMultiplePrompts:
     def __init__(
         self,
@@ -0,0 +1,50 @@
+import json
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import MD5, Cast
+
+
+def dedupe_examples(apps, schema_editor):
+    """
+    The pre-constraint code re-inserted the same (workflow, text) rows on
+    every iterate call, so populated databases hold duplicates that would
+    abort AddConstraint. Keep the newest row per (workflow, text).
+    """
+    Examples = apps.get_model("workflow", "Examples")
+    seen = set()
+    duplicates = []
+    for example_id, workflow_id, text in (
+        Examples.objects.order_by("-created_at")
+        .values_list("example_id", "workflow_id", "text")
+        .iterator(chunk_size=1000)
+    ):
+        key = (workflow_id, json.dumps(text, sort_keys=True))
+        if key in seen:
+            duplicates.append(example_id)
+        else:
+            seen.add(key)
+
+    for start in range(0, len(duplicates), 1000):
+        Examples.objects.filter(
+            example_id__in=duplicates[start : start + 1000]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflow", "0035_alter_mlmodel_latest_commit_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_examples, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="examples",
+            constraint=models.UniqueConstraint(
+                F("workflow"),
+                MD5(Cast("text", models.TextField())),
+                name="unique_example_workflow_text",
+            ),
+        ),
+    ]
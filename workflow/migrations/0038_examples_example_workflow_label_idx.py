@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflow", "0037_task_task_workflow_status_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="examples",
+            index=models.Index(
+                fields=["workflow", "label"], name="example_workflow_label_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workflow", "0038_examples_example_workflow_label_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="workflows",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tags"], name="workflows_tags_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workflows",
+            index=models.Index(
+                fields=["created_at"], name="workflow_created_at_idx"
+            ),
+        ),
+    ]
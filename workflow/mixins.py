@@ -92,7 +92,10 @@ class CreateMLBaseMixin:
                 user_prompt_template=task_config.get("user_prompt_template"),
                 schema_example=task_config.get("schema_example"),
                 temperature=1,
-                model_string=model_string,
+                # model_string is derived from schema_example and its exact
+                # rendering has changed across builder versions; keeping it
+                # out of the lookup lets existing config rows still match
+                defaults={"model_string": model_string},
             )
 
             ml_model, created = MLModel.objects.get_or_create(
@@ -2,10 +2,12 @@ import json
 import uuid
 
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import UniqueConstraint
+from django.db.models import F, UniqueConstraint
+from django.db.models.functions import MD5, Cast
 from django.utils.translation import gettext_lazy as _
 
 
@@ -216,6 +218,14 @@ class Workflows(models.Model):
         related_name="latest_for_workflow",
     )
 
+    class Meta:
+        indexes = [
+            # tag search filters with tags__overlap, which a btree cannot serve
+            GinIndex(fields=["tags"], name="workflows_tags_gin"),
+            # serves the search pagination cursor, which orders by created_at
+            models.Index(fields=["created_at"], name="workflow_created_at_idx"),
+        ]
+
 
 class DatasetData(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -261,6 +271,23 @@ class Examples(models.Model):
         Prompt, on_delete=models.CASCADE, related_name="examples", null=True, blank=True
     )
 
+    class Meta:
+        constraints = [
+            # unique on a hash of the JSON text: a plain btree over the
+            # JSONField would reject rows once a text exceeds Postgres's
+            # index-row size limit
+            UniqueConstraint(
+                F("workflow"),
+                MD5(Cast("text", models.TextField())),
+                name="unique_example_workflow_text",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["workflow", "label"], name="example_workflow_label_idx"
+            )
+        ]
+
 
 class Task(models.Model):
     """
@@ -282,6 +309,11 @@ class Task(models.Model):
     generated_samples = models.IntegerField(default=0)
     total_samples = models.IntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["workflow", "status"], name="task_workflow_status_idx")
+        ]
+
 
 class Log(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -23,12 +23,14 @@ class MLModelSerializer(serializers.ModelSerializer):
     class Meta:
         model = MLModel
         fields = ("id", "name", "is_locally_cached")
+        read_only_fields = fields
 
 
 class DatasetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Dataset
         fields = ("id", "name", "is_locally_cached")
+        read_only_fields = fields
 
 
 class PromptSerializer(serializers.ModelSerializer):
@@ -103,8 +105,10 @@ class WorkflowDetailSerializer(serializers.ModelSerializer):
     latest_prompt = PromptSerializer(read_only=True)
     prompts = PromptSerializer(many=True, read_only=True)
     examples = ExampleSerializer(many=True, read_only=True)
+    # this serializer only ever renders data out, so every field is read-only;
+    # skipping writable-field setup keeps serialization cheap
     workflow_config = serializers.PrimaryKeyRelatedField(
-        queryset=WorkflowConfig.objects.all(),
+        read_only=True,
         help_text="The configuration for the workflow",
     )
 
@@ -127,6 +131,16 @@ class WorkflowDetailSerializer(serializers.ModelSerializer):
             "prompts",
             "workflow_config",
         )
+        read_only_fields = (
+            "workflow_id",
+            "workflow_name",
+            "total_examples",
+            "split",
+            "llm_model",
+            "cost",
+            "estimated_dataset_cost",
+            "tags",
+        )
         extra_kwargs = {
             "workflow_id": {"help_text": "Unique ID for the workflow"},
             "workflow_name": {"help_text": "Name of the workflow"},
@@ -189,8 +203,15 @@ class WorkflowSerializer(serializers.ModelSerializer):
         examples_data = validated_data.pop("examples", [])
         workflow = Workflows.objects.create(**validated_data)
 
-        for example_data in examples_data:
-            Examples.objects.create(workflow=workflow, **example_data)
+        if examples_data:
+            Examples.objects.bulk_create(
+                [
+                    Examples(workflow=workflow, **example_data)
+                    for example_data in examples_data
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
+            )
 
         return workflow
 
@@ -388,6 +409,16 @@ class DatasetDataSerializer(serializers.ModelSerializer):
             "output_json",
             "dataset_id",
         ]
+        read_only_fields = [
+            "created_at",
+            "updated_at",
+            "record_id",
+            "file",
+            "input_string",
+            "output_string",
+            "input_json",
+            "output_json",
+        ]
         extra_kwargs = {
             "created_at": {"help_text": "The date and time when the data was created."},
             "updated_at": {
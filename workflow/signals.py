@@ -1,8 +1,8 @@
 from django.core.exceptions import ValidationError
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import DatasetData, Prompt, Workflows
+from .models import DatasetData, Prompt, WorkflowConfig, Workflows
 
 
 @receiver(post_save, sender=Prompt)
@@ -10,9 +10,9 @@ def update_latest_prompt(sender, instance, created, **kwargs):
     """
     Updates the latest_prompt field on the Workflows model whenever a new prompt is created or updated.
     """
-    workflow = instance.workflow
-    workflow.latest_prompt = instance
-    workflow.save()
+    # queryset update writes the one column instead of saving the whole row
+    # (a full save would also re-fire validate_workflow for an unrelated edit)
+    Workflows.objects.filter(pk=instance.workflow_id).update(latest_prompt=instance)
 
 
 @receiver(pre_save, sender=Workflows)
@@ -33,3 +33,15 @@ def validate_workflow(sender, instance, **kwargs):
             )
         if not instance.tags:
             raise ValidationError("Tags are required for COMPLETE type workflows.")
+
+
+@receiver(post_save, sender=WorkflowConfig)
+@receiver(post_delete, sender=WorkflowConfig)
+def invalidate_workflow_config_cache(sender, instance, **kwargs):
+    """
+    Drops the cached entry for a WorkflowConfig whenever it is saved or deleted,
+    so get_workflow_config never serves a stale config.
+    """
+    from .utils import dehydrate_cache
+
+    dehydrate_cache(f"workflow_config_{instance.id}")
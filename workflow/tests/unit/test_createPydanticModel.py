@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+from pydantic import BaseModel, ValidationError
+
+from workflow.utils import _build_model_cached, create_pydantic_model
+
+
+class TestCreatePydanticModel(unittest.TestCase):
+
+    def setUp(self):
+        # the builder caches on the canonical schema JSON; clear it so each
+        # test exercises a fresh build
+        _build_model_cached.cache_clear()
+
+    def schema_example(self):
+        return {
+            "text": "string",
+            "choices": [
+                {"text": "string", "score": 0},
+            ],
+        }
+
+    def test_builds_model_for_nested_schema(self):
+        Model, _ = create_pydantic_model(self.schema_example())
+
+        validated = Model.model_validate(
+            {
+                "text": "question 1",
+                "choices": [
+                    {"text": "answer 1", "score": 0},
+                    {"text": "answer 2", "score": 1},
+                ],
+            },
+            strict=True,
+        )
+
+        self.assertTrue(issubclass(Model, BaseModel))
+        self.assertEqual(validated.text, "question 1")
+        self.assertEqual(validated.choices[1].score, 1)
+
+    def test_rejects_payload_not_matching_schema(self):
+        Model, _ = create_pydantic_model(self.schema_example())
+
+        with self.assertRaises(ValidationError):
+            Model.model_validate({"text": 1, "choices": []}, strict=True)
+
+    def test_class_string_lists_every_field(self):
+        _, class_string = create_pydantic_model(self.schema_example())
+
+        self.assertIn("class Choice(BaseModel):", class_string)
+        self.assertIn("class Model(BaseModel):", class_string)
+        self.assertIn("text: str", class_string)
+        self.assertIn("score: int", class_string)
+        self.assertIn("choices: List[Choice]", class_string)
+
+        # fields render in the caller's schema order, not sorted: "choices"
+        # precedes "text" alphabetically but follows it in the schema
+        model_class = class_string.split("class Model(BaseModel):")[1]
+        self.assertLess(model_class.index("text:"), model_class.index("choices:"))
+
+    @patch("workflow.utils._build_model_via_codegen")
+    def test_unbuildable_schema_falls_back_to_codegen(self, mock_codegen):
+        sentinel = (object(), "class Model(BaseModel):\n")
+        mock_codegen.return_value = sentinel
+
+        result = create_pydantic_model("not a schema dict")
+
+        self.assertEqual(result, sentinel)
+        mock_codegen.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,6 +12,7 @@ from .views import (
     ModelDeployView,
     PromptViewSet,
     SingleWorkflowView,
+    TaskProgressView,
     TrainModelView,
     WorkflowConfigView,
     WorkflowDuplicateView,
@@ -52,6 +53,11 @@ urlpatterns = [
         WorkflowStatusView.as_view(),
         name="workflow-status",
     ),
+    path(
+        "progress/<uuid:workflow_id>/",
+        TaskProgressView.as_view(),
+        name="task-progress",
+    ),
     path(
         "generate/<uuid:workflow_id>/", GenerateTaskView.as_view(), name="generate-task"
     ),
@@ -1,3 +1,5 @@
+import functools
+import hashlib
 import importlib.util
 import inspect
 import json
@@ -5,23 +7,44 @@ import logging
 import os
 import subprocess
 import sys
-import tempfile
+import types
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Any, List, get_args, get_origin, get_type_hints
 
 from django.core.cache import cache
-from django.shortcuts import get_object_or_404
-from pydantic import BaseModel
+from django.db import transaction
+from django.http import Http404
+from pydantic import BaseModel, create_model
 from pydantic import ValidationError as PydanticValidationError
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
-from .models import Examples, WorkflowConfig
+from .models import Examples, WorkflowConfig, Workflows
 from .serializers import ExampleSerializer
 
 logger = logging.getLogger(__name__)
 
 
+def workflow_detail_queryset():
+    """
+    Workflows queryset with the relations WorkflowDetailSerializer renders
+    pre-fetched, so serializing a workflow does not trigger per-row queries
+    for the user, model, prompts and examples.
+    """
+    return Workflows.objects.select_related(
+        "user", "model", "latest_prompt"
+    ).prefetch_related("prompts", "examples")
+
+
+# Sentinel cached on a miss so repeated lookups for a missing config don't
+# stampede the database. Kept short-lived so a freshly created config shows up.
+WORKFLOW_CONFIG_CACHE_TIMEOUT = 300
+WORKFLOW_CONFIG_MISS_TIMEOUT = 30
+_WORKFLOW_CONFIG_MISS = "__workflow_config_miss__"
+
+
 def get_workflow_config(workflow_config):
     """
     Fetches a WorkflowConfig object from the cache or database by workflow_config.
@@ -34,11 +57,48 @@ def get_workflow_config(workflow_config):
     config = cache.get(cache_key)
 
     if config is None:
-        get_object_or_404(WorkflowConfig, id=workflow_config)
+        # django-redis exposes a distributed lock; use it so concurrent
+        # requests for the same uncached config coalesce into one DB fetch.
+        lock = (
+            cache.lock(f"{cache_key}:lock", timeout=5)
+            if hasattr(cache, "lock")
+            else nullcontext()
+        )
+        with lock:
+            config = cache.get(cache_key)
+            if config is None:
+                config = WorkflowConfig.objects.filter(id=workflow_config).first()
+                if config is None:
+                    cache.set(
+                        cache_key, _WORKFLOW_CONFIG_MISS, WORKFLOW_CONFIG_MISS_TIMEOUT
+                    )
+                else:
+                    cache.set(cache_key, config, WORKFLOW_CONFIG_CACHE_TIMEOUT)
+
+    if config is None or config == _WORKFLOW_CONFIG_MISS:
+        raise Http404(f"No WorkflowConfig matches id {workflow_config}.")
 
     return config
 
 
+# Server-side SCAN + UNLINK loop: clearing a key pattern costs one round trip
+# instead of django-redis's client-side SCAN/DEL loop, and UNLINK frees the
+# memory asynchronously.
+_DEHYDRATE_PATTERN_LUA = """
+local cursor = "0"
+local deleted = 0
+repeat
+    local result = redis.call("SCAN", cursor, "MATCH", ARGV[1], "COUNT", 500)
+    cursor = result[1]
+    if #result[2] > 0 then
+        deleted = deleted + redis.call("UNLINK", unpack(result[2]))
+    end
+until cursor == "0"
+return deleted
+"""
+_dehydrate_script = None
+
+
 def dehydrate_cache(key_pattern):
     """
     Dehydrates (clears) cache entries based on a given key pattern.
@@ -52,52 +112,185 @@ def dehydrate_cache(key_pattern):
     Returns:
     - None
     """
-    if hasattr(cache, "delete_pattern"):
-        cache.delete_pattern(key_pattern)
-    else:
-        cache.delete(key_pattern)
+    global _dehydrate_script
+
+    try:
+        client = cache.client.get_client(write=True)
+        pattern = cache.client.make_pattern(key_pattern)
+    except AttributeError:
+        # not a django-redis backend; fall back to the portable code path
+        if hasattr(cache, "delete_pattern"):
+            cache.delete_pattern(key_pattern)
+        else:
+            cache.delete(key_pattern)
+        return
+
+    if _dehydrate_script is None:
+        _dehydrate_script = client.register_script(_DEHYDRATE_PATTERN_LUA)
+    _dehydrate_script(args=[pattern], client=client)
 
 
 def create_pydantic_model(jsonData):
-    Model = None
-    with tempfile.NamedTemporaryFile(
-        mode="w+", dir=os.getcwd(), suffix=".json", delete=True
-    ) as tmp_json:
-        json.dump(jsonData, tmp_json)
-        tmp_json.flush()
-
-        with tempfile.NamedTemporaryFile(
-            mode="w+", dir=os.getcwd(), suffix=".py", delete=True
-        ) as tmp_py:
-            command = (
-                f"datamodel-codegen --input {tmp_json.name} --output {tmp_py.name}"
-            )
+    """
+    Builds a pydantic model class from a schema example (e.g. a WorkflowConfig's
+    schema_example) along with its rendered class string.
 
-            try:
-                subprocess.run(command, check=True, shell=True)
-                print("model generation successful")
-            except subprocess.CalledProcessError as e:
-                print("An error occurred while generating the pydantic model:", e)
+    The model is constructed in-process with pydantic.create_model and cached on
+    the canonical JSON of the schema, so repeated calls for the same schema are
+    dictionary lookups instead of code generation.
 
-            tmp_py_path = Path(tmp_py.name)
-            Model = import_model_from_generated_file(tmp_py_path)
+    :param jsonData: example JSON (dict) describing the expected structure.
+    :return: (Model, class_string) tuple.
+    """
+    # the canonical dump is only the cache key; the model is built from an
+    # order-preserving dump so field order follows the caller's schema
+    # instead of sort_keys order
+    return _build_model_cached(
+        json.dumps(jsonData, sort_keys=True), json.dumps(jsonData)
+    )
 
-            class_string = get_classes_from_module(tmp_py_path, base_class=BaseModel)
 
-    return Model, class_string
+@functools.lru_cache(maxsize=256)
+def _build_model_cached(canonical_json, schema_json):
+    schema = json.loads(schema_json)
+    try:
+        Model = _build_model("Model", schema)
+    except Exception:
+        logger.exception(
+            "In-process model build failed, falling back to datamodel-codegen"
+        )
+        return _build_model_via_codegen(schema_json)
+    return Model, get_model_class_string(Model)
 
 
-def import_model_from_generated_file(file_path):
-    directory, module_name = os.path.split(file_path)
-    module_name = os.path.splitext(module_name)[0]
+# a week; sources are tiny and regenerating on a cold miss is just one
+# subprocess run per distinct schema
+CODEGEN_SOURCE_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def _build_model_via_codegen(schema_json):
+    """
+    Fallback for schema shapes the in-process builder cannot handle: pipes the
+    schema through datamodel-codegen (stdin to stdout, no tempfiles or shell)
+    and execs the generated source into a fresh module namespace. The generated
+    source is persisted in the cache keyed by a hash of the schema, so across
+    worker restarts and processes the subprocess only runs once per distinct
+    schema; the caller's schema-keyed LRU handles repeat calls in-process.
+    """
+    schema_hash = hashlib.blake2b(
+        schema_json.encode("utf-8"), digest_size=16
+    ).hexdigest()
+    cache_key = f"pydantic_model_source_{schema_hash}"
+
+    source = cache.get(cache_key)
+    if source is None:
+        result = subprocess.run(
+            ["datamodel-codegen", "--input-file-type", "json"],
+            input=schema_json,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        source = result.stdout
+        cache.set(cache_key, source, CODEGEN_SOURCE_CACHE_TIMEOUT)
+
+    module = types.ModuleType("autotune_generated_model")
+    exec(compile(source, "<datamodel-codegen>", "exec"), module.__dict__)
+
+    Model = getattr(module, "Model", None)
+    return Model, _render_module_classes(module, BaseModel)
+
+
+def _build_model(name, example):
+    """Recursively builds a pydantic model class from an example dict."""
+    fields = {
+        field_name: (_field_type(field_name, value), ...)
+        for field_name, value in example.items()
+    }
+    return create_model(name, **fields)
+
+
+def _field_type(field_name, value):
+    if isinstance(value, dict):
+        return _build_model(_nested_class_name(field_name), value)
+    if isinstance(value, list):
+        if value and isinstance(value[0], dict):
+            return List[_build_model(_nested_class_name(field_name), value[0])]
+        if value:
+            return List[type(value[0])]
+        return List[Any]
+    return type(value)
+
+
+def _nested_class_name(field_name):
+    # "choices" -> "Choice", matching the names datamodel-codegen used to emit
+    singular = field_name[:-1] if field_name.endswith("s") else field_name
+    return singular[:1].upper() + singular[1:]
+
+
+def _annotation_name(annotation):
+    origin = get_origin(annotation)
+    if origin in (list, List):
+        (item_type,) = get_args(annotation)
+        return f"List[{_annotation_name(item_type)}]"
+    return annotation.__name__ if hasattr(annotation, "__name__") else repr(annotation)
 
-    if directory not in sys.path:
-        sys.path.append(directory)
 
-    spec = importlib.util.spec_from_file_location(module_name, str(file_path))
+def get_model_class_string(Model, base_class=BaseModel):
+    """
+    Renders a pydantic model (nested models first) as a class string. The
+    format is close to, but not byte-identical with, what the old
+    generated-module parser produced (annotations are unquoted), so the
+    result is derived data and must not be used as a database lookup key.
+    """
+    parts = []
+    _append_model_class(parts, Model, base_class)
+    return "".join(parts)
+
+
+def _append_model_class(parts, Model, base_class):
+    append = parts.append
+    for field in Model.model_fields.values():
+        nested = field.annotation
+        if get_origin(nested) in (list, List):
+            (nested,) = get_args(nested)
+        if inspect.isclass(nested) and issubclass(nested, base_class):
+            _append_model_class(parts, nested, base_class)
+
+    append(f"\nclass {Model.__name__}({base_class.__name__}):\n")
+    for field_name, field in Model.model_fields.items():
+        append(f"  {field_name}: {_annotation_name(field.annotation)}\n")
+
+
+# Directories already appended to sys.path for generated modules; appending
+# unconditionally on every import leaks path entries.
+_module_dirs_on_path = set()
+
+
+@functools.lru_cache(maxsize=128)
+def _load_module(path_str, mtime_ns):
+    """
+    Loads and executes a module from a file path, cached on (path, mtime) so
+    repeated imports of an unchanged file return the already-loaded module and
+    an edited file is transparently reloaded.
+    """
+    module_name = Path(path_str).stem
+    spec = importlib.util.spec_from_file_location(module_name, path_str)
     module = importlib.util.module_from_spec(spec)
+    # register before exec so spec lookups for the same name short-circuit
+    sys.modules[module_name] = module
     spec.loader.exec_module(module)
+    return module
+
+
+def import_model_from_generated_file(file_path):
+    directory = os.path.dirname(file_path)
 
+    if directory not in _module_dirs_on_path:
+        _module_dirs_on_path.add(directory)
+        sys.path.append(directory)
+
+    module = import_module_from_path(file_path)
     Model = getattr(module, "Model", None)
     return Model
 
@@ -106,85 +299,105 @@ def import_module_from_path(path):
     """Import a module from the given file path"""
     if isinstance(path, str):
         path = Path(path)  # Convert string to Path if necessary
-    module_name = path.stem  # Using path.stem to get a module name from the file name
-    spec = importlib.util.spec_from_file_location(module_name, str(path))
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+    return _load_module(str(path), path.stat().st_mtime_ns)
 
 
 def get_classes_from_module(path, base_class):
     module = import_module_from_path(path)
-    class_details = ""
-    for name, obj in inspect.getmembers(module, inspect.isclass):
-        if issubclass(obj, base_class) and obj.__module__ == module.__name__:
-            class_details += f"\nclass {name}({base_class.__name__}):\n"
-            for field_name, field_type in obj.__annotations__.items():
-                field_type_name = (
-                    field_type.__name__
-                    if hasattr(field_type, "__name__")
-                    else repr(field_type)
-                )
-                class_details += f"  {field_name}: {field_type_name}\n"
+    return _render_module_classes(module, base_class)
+
 
-    return class_details
+@functools.lru_cache(maxsize=128)
+def _render_module_classes(module, base_class):
+    """
+    Renders the base_class subclasses defined in a module as a class string.
+    Cached per module object, which is stable for unchanged files thanks to
+    the mtime-keyed import cache.
+    """
+    parts = []
+    # scan module.__dict__ directly instead of inspect.getmembers, which
+    # sorts every member and probes attributes one by one
+    for name, obj in vars(module).items():
+        if (
+            isinstance(obj, type)
+            and obj.__module__ == module.__name__
+            and issubclass(obj, base_class)
+        ):
+            parts.append(f"\nclass {name}({base_class.__name__}):\n")
+            for field_name, field_type in get_type_hints(obj, vars(module)).items():
+                parts.append(f"  {field_name}: {_annotation_name(field_type)}\n")
+
+    return "".join(parts)
 
 
 def validate_and_save_examples(examples_data, Model, workflow):
-    examples = []
+    objs = []
     for example_data in examples_data:
         serializer = ExampleSerializer(data=example_data)
 
-        print(serializer.is_valid())
-
-        if serializer.is_valid():
-            example_id = serializer.validated_data.get("example_id", None)
-            text = serializer.validated_data["text"]
-            label = serializer.validated_data["label"]
-            reason = serializer.validated_data["reason"]
-
-            try:
-                Model(**text)
-            except PydanticValidationError as e:
-                logger.error("huh")
-                return False, {"error": True, "message": e.errors()}
-
-            if example_id:
-                example, created = Examples.objects.get_or_create(
-                    example_id=example_id,
-                    defaults={
-                        "workflow": workflow,
-                        "text": text,
-                        "label": label,
-                        "reason": reason,
-                    },
-                )
-
-                if not created:
-                    example.text = text
-                    example.label = label
-                    example.reason = reason
-                    example.save()
-            else:
-                example = Examples.objects.create(
-                    workflow=workflow,
-                    text=text,
-                    label=label,
-                    reason=reason,
-                )
-
-            examples.append(
-                {
-                    "example_id": str(example.example_id),
-                    "text": example.text,
-                    "label": example.label,
-                    "reason": example.reason,
-                }
-            )
-
-        else:
+        if not serializer.is_valid():
             return False, serializer.errors
 
+        text = serializer.validated_data["text"]
+        label = serializer.validated_data["label"]
+        reason = serializer.validated_data["reason"]
+
+        try:
+            Model(**text)
+        except PydanticValidationError as e:
+            logger.error("huh")
+            return False, {"error": True, "message": e.errors()}
+
+        objs.append(
+            Examples(workflow=workflow, text=text, label=label, reason=reason)
+        )
+
+    # within one payload the last occurrence of a text wins, matching the
+    # old save-over-save loop and keeping the write free of duplicate keys
+    deduped = {}
+    for obj in objs:
+        deduped[json.dumps(obj.text, sort_keys=True)] = obj
+
+    # split into updates of existing (workflow, text) rows and fresh inserts
+    # instead of ON CONFLICT DO UPDATE: the unique constraint hashes the JSON
+    # text so it cannot be an upsert target, and this keeps real primary keys
+    # for the response (bulk_create upserts do not return them)
+    with transaction.atomic():
+        existing = {
+            json.dumps(example.text, sort_keys=True): example
+            for example in Examples.objects.filter(
+                workflow=workflow,
+                text__in=[obj.text for obj in deduped.values()],
+            )
+        }
+        to_update = []
+        to_create = []
+        saved = []
+        for key, obj in deduped.items():
+            current = existing.get(key)
+            if current is not None:
+                current.label = obj.label
+                current.reason = obj.reason
+                to_update.append(current)
+                saved.append(current)
+            else:
+                to_create.append(obj)
+                saved.append(obj)
+        if to_update:
+            Examples.objects.bulk_update(to_update, ["label", "reason"])
+        if to_create:
+            Examples.objects.bulk_create(to_create)
+
+    examples = [
+        {
+            "example_id": str(example.example_id),
+            "text": example.text,
+            "label": example.label,
+            "reason": example.reason,
+        }
+        for example in saved
+    ]
+
     return True, examples
 
 
@@ -1,26 +1,26 @@
 import ast
 import io
 import logging
-from decimal import Decimal, getcontext
 
 import pandas as pd
 from django.core.exceptions import FieldDoesNotExist
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Exists, OuterRef, Q
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.generics import ListAPIView, UpdateAPIView
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from workflow.generator.dataFetcher import DataFetcher
-from workflow.generator.generate import process_task
+from workflow.generator.generate import iterate_task, process_task
 from workflow.health import HealthCheck
 from workflow.training.deploy import deploy_model
 from workflow.training.train import train
@@ -55,11 +55,11 @@ from .serializers import (
 from .utils import (
     create_pydantic_model,
     dehydrate_cache,
-    get_model_cost,
     get_task_config,
     get_task_mapping,
     paginate_queryset,
     validate_and_save_examples,
+    workflow_detail_queryset,
 )
 
 logger = logging.getLogger(__name__)
@@ -125,18 +125,23 @@ class IterateWorkflowView(UserIDMixin, APIView):
         user_id = request.META["user"].user_id
 
         workflow = get_object_or_404(
-            Workflows, workflow_id=workflow_id, user_id=user_id
+            # piggyback the labeled-examples existence check on the workflow
+            # fetch instead of issuing a separate EXISTS round trip
+            Workflows.objects.annotate(
+                has_labeled_examples=Exists(
+                    Examples.objects.filter(
+                        workflow_id=OuterRef("pk"), label__isnull=False
+                    )
+                )
+            ),
+            workflow_id=workflow_id,
+            user_id=user_id,
         )
         workflow.status = "ITERATION"
         workflow.save()
         examples_data = request.data.get("examples", [])
 
-        examples_exist = (
-            Examples.objects.filter(
-                workflow_id=workflow_id, label__isnull=False
-            ).exists()
-            or len(examples_data) > 0
-        )
+        examples_exist = len(examples_data) > 0 or workflow.has_labeled_examples
 
         Model, _ = create_pydantic_model(workflow.workflow_config.schema_example)
 
@@ -154,58 +159,30 @@ class IterateWorkflowView(UserIDMixin, APIView):
         max_concurrent_fetches = request.data.get("max_concurrent_fetches", 100)
         batch_size = request.data.get("batch_size", 5)
 
-        fetcher = DataFetcher(
-            max_iterations=int(max_iterations),
-            max_concurrent_fetches=int(max_concurrent_fetches),
-            batch_size=int(batch_size),
-        )
-        prompt: Prompt = workflow.latest_prompt
-        fetcher.generate_or_refine(
-            workflow_id=workflow.workflow_id,
-            total_examples=total_examples,
-            workflow_config_id=workflow.workflow_config.id,
-            llm_model=workflow.llm_model,
-            Model=Model,
-            prompt=prompt.user_prompt,
-            prompt_id=prompt.id,
-            refine=examples_exist,
-            iteration=1,
-        )
-
-        costs = get_model_cost(workflow.llm_model)
-
-        getcontext().prec = 6
-
-        input_cost = Decimal(fetcher.input_tokens * costs["input"]) / Decimal(1000)
-        output_cost = Decimal(fetcher.output_tokens * costs["output"]) / Decimal(1000)
-
-        iteration_cost = input_cost + output_cost
-        iteration_cost = iteration_cost.quantize(Decimal("0.0001"))
-        workflow.cost += iteration_cost
-        workflow.cost = workflow.cost.quantize(Decimal("0.0001"))
-
-        total_batches = max(
-            1,
-            (workflow.total_examples + batch_size - 1) // batch_size,
-        )
-
-        workflow.estimated_dataset_cost = Decimal(
-            Decimal(1.25) * iteration_cost * total_batches
+        # the LLM calls take seconds to minutes; run them on Celery instead of
+        # blocking the WSGI worker, and let clients poll the task for progress
+        task = Task.objects.create(
+            name=f"Iteration Task for Workflow {workflow_id}",
+            status="STARTING",
+            workflow=workflow,
         )
 
-        workflow.estimated_dataset_cost = workflow.estimated_dataset_cost.quantize(
-            Decimal("0.0001")
+        iterate_task.delay(
+            task.id,
+            int(total_examples),
+            int(max_iterations),
+            int(max_concurrent_fetches),
+            int(batch_size),
+            examples_exist,
         )
 
-        workflow.status = "IDLE"
-        workflow.save()
         return Response(
             {
-                "workflow_cost": f"${workflow.cost}",
-                "iteration_cost": f"${iteration_cost}",
-                "estimated_dataset_cost": f"${workflow.estimated_dataset_cost}",
-                "data": fetcher.examples[:total_examples],
-            }
+                "message": "Iteration initiated",
+                "task_id": task.id,
+                "workflow_id": workflow.workflow_id,
+            },
+            status=status.HTTP_202_ACCEPTED,
         )
 
 
@@ -216,7 +193,7 @@ class WorkflowListView(APIView):
         responses={200: WorkflowDetailSerializer(many=True)},
     )
     def get(self, request, *args, **kwargs):
-        workflows = Workflows.objects.all()
+        workflows = workflow_detail_queryset()
         serializer = WorkflowDetailSerializer(workflows, many=True)
         return Response(serializer.data)
 
@@ -240,7 +217,7 @@ class SingleWorkflowView(APIView):
         responses={200: WorkflowDetailSerializer()},
     )
     def get(self, request, workflow_id, *args, **kwargs):
-        workflow = get_object_or_404(Workflows, workflow_id=workflow_id)
+        workflow = get_object_or_404(workflow_detail_queryset(), workflow_id=workflow_id)
         serializer = WorkflowDetailSerializer(workflow)
         return Response(serializer.data)
 
@@ -299,9 +276,9 @@ class PromptViewSet(APIView):
         if serializer.is_valid():
             prompt = serializer.save(workflow=workflow)
 
-            # Update the latest_prompt field on the workflow to this new prompt
-            workflow.latest_prompt = prompt
-            workflow.save()
+            # Update the latest_prompt field on the workflow to this new prompt;
+            # a queryset update writes only that column instead of the full row
+            Workflows.objects.filter(pk=workflow.pk).update(latest_prompt=prompt)
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -371,6 +348,9 @@ class WorkflowDuplicateView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+# both polling endpoints below are cheap but hit hard by dashboards; a 5s
+# page cache absorbs the polling herd without making progress feel stale
+@method_decorator(cache_page(5), name="get")
 class WorkflowStatusView(APIView):
 
     @swagger_auto_schema(
@@ -382,8 +362,16 @@ class WorkflowStatusView(APIView):
         return Response({"status": workflow.status})
 
 
+class WorkflowSearchPagination(CursorPagination):
+    page_size = 50
+    # workflow_id breaks created_at ties so the cursor never skips or
+    # repeats rows at page boundaries
+    ordering = ("-created_at", "-workflow_id")
+
+
 class WorkflowSearchView(ListAPIView):
     serializer_class = WorkflowSerializer
+    pagination_class = WorkflowSearchPagination
 
     @swagger_auto_schema(
         operation_description="Search for workflows by tags",
@@ -401,7 +389,9 @@ class WorkflowSearchView(ListAPIView):
         tags_param = self.request.query_params.get("tags", "")
         tags_query = tags_param.split(",") if tags_param else []
         query = Q(tags__overlap=tags_query) if tags_query else Q()
-        return Workflows.objects.filter(query)
+        # WorkflowSerializer renders nested examples; prefetch them so the
+        # list response is two queries instead of one per workflow
+        return Workflows.objects.filter(query).prefetch_related("examples")
 
 
 class TaskView(APIView):
@@ -424,6 +414,39 @@ class TaskView(APIView):
         return Response(response_data)
 
 
+@method_decorator(cache_page(5), name="get")
+class TaskProgressView(APIView):
+
+    @swagger_auto_schema(
+        operation_description="Retrieve aggregate progress of all tasks for a workflow",
+        responses={
+            200: "A JSON object with the total, completed and percentage of tasks",
+            404: "Not Found",
+        },
+    )
+    def get(self, request, workflow_id):
+        # single pass over the (workflow, status) index instead of separate
+        # exists/count/filter-count queries
+        agg = Task.objects.filter(workflow_id=workflow_id).aggregate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status="COMPLETED")),
+        )
+
+        if agg["total"] == 0:
+            return Response(
+                {"error": "No tasks found for this workflow"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            {
+                "total": agg["total"],
+                "completed": agg["completed"],
+                "percentage": agg["completed"] / agg["total"] * 100,
+            }
+        )
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class GenerateTaskView(UserIDMixin, APIView):
 
@@ -1035,6 +1058,8 @@ class DatasetView(UserIDMixin, CreateMLBaseMixin, CacheDatasetMixin, APIView):
         )
 
 
+# task configs only change on deploy; cache the rendered response
+@method_decorator(cache_page(60 * 15), name="get")
 class ConfigView(APIView):
     @swagger_auto_schema(
         operation_description="Returns the config of all the tasks or a specific task if provided.",
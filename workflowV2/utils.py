@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.core.cache import cache
 from minio import Minio
 
 print("\nMinIO Client Initialization:")
@@ -11,4 +12,27 @@ minio_client = Minio(
     access_key=settings.MINIO_ACCESS_KEY,
     secret_key=settings.MINIO_SECRET_KEY,
     secure=settings.MINIO_SECURE_CONN == "True"
-)
\ No newline at end of file
+)
+
+# Presigned URLs default to a 7 day expiry; caching them for an hour keeps
+# repeated status/data polls from re-signing the same objects while leaving a
+# wide safety margin before expiry.
+PRESIGNED_URL_CACHE_TIMEOUT = 60 * 60
+
+
+def presigned_get_object_cached(bucket_name, object_name):
+    """
+    Returns a presigned GET URL for a MinIO object, cached per
+    (bucket, object) so hot polling endpoints reuse the generated URL.
+    """
+    cache_key = f"minio_presigned_{bucket_name}_{object_name}"
+    url = cache.get(cache_key)
+
+    if url is None:
+        url = minio_client.presigned_get_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+        )
+        cache.set(cache_key, url, PRESIGNED_URL_CACHE_TIMEOUT)
+
+    return url
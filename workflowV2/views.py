@@ -2,10 +2,14 @@ import io
 
 import pandas as pd
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_cache_key
 from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.vary import vary_on_headers
 from huggingface_hub import HfApi
 from rest_framework import status
 from rest_framework.response import Response
@@ -19,10 +23,10 @@ from workflow.serializers import (
     WorkflowDetailSerializer,
     WorkflowSerializer,
 )
-from workflow.utils import create_pydantic_model
+from workflow.utils import create_pydantic_model, workflow_detail_queryset
 from workflow.views import GenerateTaskView, IterateWorkflowView
 
-from .utils import minio_client
+from .utils import minio_client, presigned_get_object_cached
 
 
 class WorkflowListView(UserIDMixin, APIView):
@@ -32,7 +36,7 @@ class WorkflowListView(UserIDMixin, APIView):
 
     def get(self, request, *args, **kwargs):
         user_id = request.META["user"].user_id
-        workflows = Workflows.objects.filter(user_id=user_id)
+        workflows = workflow_detail_queryset().filter(user_id=user_id)
         serializer = WorkflowDetailSerializer(workflows, many=True)
         return Response(serializer.data)
 
@@ -44,6 +48,10 @@ class WorkflowListView(UserIDMixin, APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+# vary_on_headers sits inside cache_page so cached entries are keyed per
+# User-Id and one user's detail response is never served to another
+@method_decorator(cache_page(60), name="get")
+@method_decorator(vary_on_headers("User-Id"), name="get")
 class WorkflowDetailView(UserIDMixin, APIView):
     """
     Retrieve, update, or delete a workflow instance.
@@ -53,7 +61,7 @@ class WorkflowDetailView(UserIDMixin, APIView):
         user_id = request.META["user"].user_id
 
         workflow = get_object_or_404(
-            Workflows, workflow_id=workflow_id, user_id=user_id
+            workflow_detail_queryset(), workflow_id=workflow_id, user_id=user_id
         )
         serializer = WorkflowDetailSerializer(workflow)
         return Response(serializer.data)
@@ -67,6 +75,7 @@ class WorkflowDetailView(UserIDMixin, APIView):
         serializer = WorkflowSerializer(workflow, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            self._invalidate_detail_cache(request)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -77,8 +86,17 @@ class WorkflowDetailView(UserIDMixin, APIView):
             Workflows, workflow_id=workflow_id, user_id=user_id
         )
         workflow.delete()
+        self._invalidate_detail_cache(request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def _invalidate_detail_cache(self, request):
+        # the mutating request carries the same path and User-Id header as
+        # the cached GET, so get_cache_key resolves the exact page-cache
+        # entry to drop and the user reads their own write immediately
+        cache_key = get_cache_key(request, method="GET")
+        if cache_key:
+            cache.delete(cache_key)
+
 
 @method_decorator(csrf_exempt, name="dispatch")
 class WorkflowConfigCreateView(UserIDMixin, APIView):
@@ -264,7 +282,7 @@ class GetDataView(UserIDMixin, APIView):
         files = ["test", "validation", "train"]
         csv_links = {}
         minio_file_name = f"{dataset.huggingface_id.split('/')[1]}/{dataset.latest_commit_hash}/data.json"
-        json_url = minio_client.presigned_get_object(
+        json_url = presigned_get_object_cached(
             bucket_name=settings.MINIO_BUCKET_NAME,
             object_name=minio_file_name,
         )
@@ -304,7 +322,7 @@ class GetDataView(UserIDMixin, APIView):
                             length=buffer.getbuffer().nbytes,
                             content_type="application/csv",
                         )
-                    presigned_url = minio_client.presigned_get_object(
+                    presigned_url = presigned_get_object_cached(
                         bucket_name=settings.MINIO_BUCKET_NAME,
                         object_name=minio_file_name,
                     )